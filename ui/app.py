@@ -1,11 +1,30 @@
+import asyncio
+import hashlib
+import html
+import string
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import compress
+from typing import NamedTuple
+
 import streamlit as st
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-from sklearn.model_selection import GridSearchCV, TimeSeriesSplit
+import pyarrow as pa
+import pyarrow.csv as pacsv
+from joblib import parallel_config
+from scipy.stats import loguniform
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import HalvingRandomSearchCV, TimeSeriesSplit
 from sklearn.svm import SVR
-from datetime import datetime, timedelta
-import requests
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+import httpx
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
 # =====================================
 # PAGE CONFIG
@@ -90,48 +109,76 @@ news_dark_mode = st.sidebar.checkbox("Dark mode for news cards", value=False)
 # DATA / MODEL HELPERS
 # =====================================
 @st.cache_data(show_spinner=False)
-def load_price_data(file) -> pd.DataFrame:
+def load_price_data(file):
     if file is not None:
-        df = pd.read_csv(file)
+        raw = file.getvalue()
     else:
-        df = pd.read_csv("bitcoin.csv")
+        with open("bitcoin.csv", "rb") as f:
+            raw = f.read()
+
+    # Content hash used as the model cache key, so identical CSVs reuse the
+    # trained model across reruns and re-uploads.
+    data_key = hashlib.sha256(raw).hexdigest()
+    df = pacsv.read_csv(pa.BufferReader(raw)).to_pandas()
 
     expected_cols = {"Date", "Price"}
     if not expected_cols.issubset(df.columns):
         raise ValueError("CSV must contain at least 'Date' and 'Price' columns.")
 
     df["Date"] = pd.to_datetime(df["Date"])
+    # float64 because libsvm's SVR would otherwise convert y on every fit.
+    df["Price"] = df["Price"].astype(np.float64)
     df = df.sort_values("Date").reset_index(drop=True)
-    return df
+
+    # datetime.toordinal values: Unix epoch days + 719163 (ordinal of 1970-01-01).
+    # Computed once per file and cached along with the frame; stored as float64
+    # so prepare_features can hand it to sklearn without a conversion copy.
+    days = df["Date"].values.astype("datetime64[D]").astype(np.int64)
+    df["Date_ordinal"] = (days + 719163).astype(np.float64)
+    return df, data_key
 
 
 def prepare_features(df: pd.DataFrame):
-    df = df.copy()
-    df["Date_ordinal"] = df["Date"].map(datetime.toordinal)
-    X = df[["Date_ordinal"]].values
-    y = df["Price"].values
+    # Views onto the cached frame's float64 columns, in the dtype SVR uses,
+    # so neither this function nor SVR.fit has to copy them.
+    X = df["Date_ordinal"].to_numpy().reshape(-1, 1)
+    y = df["Price"].to_numpy()
     return X, y
 
 
 @st.cache_resource(show_spinner=False)
-def train_model(X, y):
-    tscv = TimeSeriesSplit(n_splits=5)
+def train_model(data_key: str, _X, _y):
+    # Only data_key is hashed by Streamlit; the arrays are derived from it.
+    tscv = TimeSeriesSplit(n_splits=3)
 
-    param_grid = {
-        "C": [1, 10, 100],
-        "gamma": [0.001, 0.01, 0.1],
+    param_distributions = {
+        "C": loguniform(1, 1e3),
+        "gamma": loguniform(1e-4, 1e-1),
         "kernel": ["rbf"],
     }
 
     svr = SVR()
-    grid_search = GridSearchCV(
+    # Successive halving: candidates are scored on growing subsets of the
+    # training folds and only the best third advances each round. "exhaust"
+    # sizes the rounds so the last one uses (nearly) all rows.
+    grid_search = HalvingRandomSearchCV(
         svr,
-        param_grid,
+        param_distributions,
+        n_candidates=9,
+        factor=3,
+        min_resources="exhaust",
         cv=tscv,
         scoring="neg_mean_squared_error",
         n_jobs=-1,
+        random_state=0,
     )
-    grid_search.fit(X, y)
+    # Explicit loky pool without memmapping: X is tiny, so per-task overhead
+    # dominates over data transfer. inner_max_num_threads=1 keeps each worker's
+    # native thread pools single-threaded to avoid oversubscription.
+    with parallel_config(
+        backend="loky", n_jobs=-1, inner_max_num_threads=1, max_nbytes=None
+    ):
+        grid_search.fit(_X, _y)
 
     best_model = grid_search.best_estimator_
     best_score = grid_search.best_score_
@@ -142,8 +189,9 @@ def train_model(X, y):
 
 def make_forecast(model, df: pd.DataFrame, horizon: int) -> pd.DataFrame:
     last_date = df["Date"].max()
-    future_dates = [last_date + timedelta(days=i) for i in range(1, horizon + 1)]
-    future_ordinals = np.array([d.toordinal() for d in future_dates]).reshape(-1, 1)
+    offsets = np.arange(1, horizon + 1)
+    future_dates = last_date + pd.to_timedelta(offsets, unit="D")
+    future_ordinals = (last_date.toordinal() + offsets).reshape(-1, 1).astype(np.float64)
     preds = model.predict(future_ordinals)
 
     forecast_df = pd.DataFrame(
@@ -155,127 +203,166 @@ def make_forecast(model, df: pd.DataFrame, horizon: int) -> pd.DataFrame:
     return forecast_df
 
 
-def create_plot(df: pd.DataFrame, forecast_df: pd.DataFrame, horizon: int):
-    fig, ax = plt.subplots(figsize=(11, 5))
+# =====================================
+# CRYPTO NEWS HELPERS
+# =====================================
+class Article(NamedTuple):
+    title: str
+    description: str
+    link: str
+    pub_date: str
+    source: str
 
-    ax.plot(df["Date"], df["Price"], label="Historical Price")
-    ax.plot(
-        forecast_df["Date"],
-        forecast_df["Predicted Price"],
-        linestyle="--",
-        marker="o",
-        label=f"{horizon}-Day Forecast",
-    )
 
-    ax.set_xlabel("Date")
-    ax.set_ylabel("Price (USD)")
-    ax.set_title("Bitcoin Price History and Forecast")
-    ax.legend()
-    fig.autofmt_xdate()
+class NewsAPIError(Exception):
+    """NewsData.io answered, but without a usable result set."""
 
-    return fig
 
+NEWS_API_URL = "https://newsdata.io/api/1/crypto"
 
-# =====================================
-# CRYPTO NEWS HELPERS
-# =====================================
-@st.cache_data(show_spinner=False)
-def fetch_crypto_news(api_key: str, coin: str, language: str = "en", items: int = 20):
-    """
-    Fetch latest crypto news from NewsData.io Crypto News API.
-    Example: https://newsdata.io/api/1/crypto?apikey=KEY&coin=btc
-    """
-    base_url = "https://newsdata.io/api/1/crypto"
+NEWS_CACHE_TTL = 300  # seconds
+
+# Prefetched alongside other languages so switching to it hits the cache.
+PREFETCH_LANGUAGE = "en"
+
+
+async def _fetch_one(client: httpx.AsyncClient, coin: str, language: str, items: int, api_key: str):
     params = {
         "apikey": api_key,
         "coin": coin.lower(),
         "language": language,
     }
 
-    try:
-        resp = requests.get(base_url, params=params, timeout=10)
-        resp.raise_for_status()
-        data = resp.json()
-
-        if data.get("status") != "success":
-            return [], f"API returned non-success status: {data.get('status', 'unknown')}"
-
-        results = data.get("results") or data.get("articles") or []
-        news_items = []
-        for item in results[:items]:
-            news_items.append(
-                {
-                    "title": item.get("title") or "Untitled",
-                    "description": item.get("description") or "",
-                    "link": item.get("link") or item.get("url") or "",
-                    "pubDate": item.get("pubDate") or item.get("published_at") or "",
-                    "source": (
-                        item.get("source_name")
-                        or item.get("source_id")
-                        or (item.get("source") or {}).get("name", "")
-                    ),
-                }
-            )
+    resp = await client.get(NEWS_API_URL, params=params)
+    resp.raise_for_status()
+    data = json_loads(resp.content)
+
+    if data.get("status") != "success":
+        raise NewsAPIError(
+            f"API returned non-success status: {data.get('status', 'unknown')}"
+        )
+
+    results = data.get("results") or data.get("articles") or []
+    return [
+        Article(
+            title=item.get("title") or "Untitled",
+            description=item.get("description") or "",
+            link=item.get("link") or item.get("url") or "",
+            pub_date=item.get("pubDate") or item.get("published_at") or "",
+            source=(
+                item.get("source_name")
+                or item.get("source_id")
+                or (item.get("source") or {}).get("name", "")
+            ),
+        )
+        for item in results[:items]
+    ]
+
+
+async def prefetch(coin: str, languages, items: int, api_key: str):
+    # One HTTP/2 connection multiplexes the per-language requests.
+    transport = httpx.AsyncHTTPTransport(http2=True, retries=2)
+    async with httpx.AsyncClient(transport=transport, timeout=10) as client:
+        return await asyncio.gather(
+            *[_fetch_one(client, coin, lang, items, api_key) for lang in languages],
+            return_exceptions=True,
+        )
+
+
+@st.cache_resource(show_spinner=False)
+def _warm_news_keys() -> dict:
+    # (coin, language, items) -> monotonic time its _cached_articles entry expires.
+    return {}
+
+
+@st.cache_data(ttl=NEWS_CACHE_TTL, show_spinner=False, max_entries=16)
+def _cached_articles(coin: str, language: str, items: int, _api_key: str, _prefetched=None):
+    # One cache entry per language. The API key is underscore-prefixed so it
+    # is neither part of the cache key nor persisted with the entry; failures
+    # raise and are not cached. Passing _prefetched stores already-fetched
+    # articles under this key without another request.
+    if _prefetched is not None:
+        articles = _prefetched
+    else:
+        languages = [language]
+        warm_until = _warm_news_keys().get((coin, PREFETCH_LANGUAGE, items), 0.0)
+        if language != PREFETCH_LANGUAGE and warm_until < time.monotonic():
+            languages.append(PREFETCH_LANGUAGE)
+
+        results = asyncio.run(prefetch(coin, languages, items, _api_key))
+        for lang, extra in zip(languages[1:], results[1:]):
+            if not isinstance(extra, BaseException):
+                _cached_articles(coin, lang, items, _api_key=_api_key, _prefetched=extra)
+
+        if isinstance(results[0], BaseException):
+            raise results[0]
+        articles = results[0]
+
+    _warm_news_keys()[(coin, language, items)] = time.monotonic() + NEWS_CACHE_TTL
+    return articles
+
+
+def fetch_crypto_news(api_key: str, coin: str, language: str = "en", items: int = 20):
+    """
+    Fetch latest crypto news from NewsData.io Crypto News API.
+    Example: https://newsdata.io/api/1/crypto?apikey=KEY&coin=btc
 
-        return news_items, None
+    A cache miss for another language also fetches PREFETCH_LANGUAGE over the
+    same connection (unless it is already cached), so switching to it later
+    is a cache hit.
+    """
+    try:
+        return _cached_articles(coin, language, items, _api_key=api_key), None
 
-    except requests.exceptions.RequestException as e:
+    except NewsAPIError as e:
+        return [], str(e)
+    except httpx.HTTPError as e:
         return [], f"Network or API error: {e}"
     except Exception as e:
         return [], f"Unexpected error while parsing news: {e}"
 
 
-def render_news_card(article, dark: bool):
-    title = article["title"]
-    desc = article["description"]
-    link = article["link"]
-    pub = article["pubDate"]
-    source = article["source"]
-
-    if dark:
-        bg = "#111827"
-        border = "#374151"
-        title_color = "#e5e7eb"
-        text_color = "#d1d5db"
-        meta_color = "#9ca3af"
-        link_color = "#60a5fa"
-    else:
-        bg = "#fafafa"
-        border = "#e0e0e0"
-        title_color = "#111827"
-        text_color = "#374151"
-        meta_color = "#6b7280"
-        link_color = "#2563eb"
-
-    meta_parts = []
-    if source:
-        meta_parts.append(f"<span>Source: <strong>{source}</strong></span>")
-    if pub:
-        meta_parts.append(f"<span>Published: <strong>{pub}</strong></span>")
-    meta_html = " • ".join(meta_parts) if meta_parts else ""
+_DARK_STYLE = {
+    "bg": "#111827",
+    "border": "#374151",
+    "title_color": "#e5e7eb",
+    "text_color": "#d1d5db",
+    "meta_color": "#9ca3af",
+    "link_color": "#60a5fa",
+}
+_LIGHT_STYLE = {
+    "bg": "#fafafa",
+    "border": "#e0e0e0",
+    "title_color": "#111827",
+    "text_color": "#374151",
+    "meta_color": "#6b7280",
+    "link_color": "#2563eb",
+}
 
-    html = f"""
+# Built once at import; only the per-article fields are substituted per card.
+_CARD_TEMPLATE = string.Template(
+    """
     <div style="
         border-radius: 0.9rem;
-        border: 1px solid {border};
-        background: {bg};
+        border: 1px solid $border;
+        background: $bg;
         padding: 1rem 1.2rem;
         margin-bottom: 0.9rem;
     ">
-        <div style="font-weight: 600; font-size: 1.05rem; color: {title_color}; margin-bottom: 0.25rem;">
-            {title}
+        <div style="font-weight: 600; font-size: 1.05rem; color: $title_color; margin-bottom: 0.25rem;">
+            $title
         </div>
-        <div style="font-size: 0.83rem; color: {meta_color}; margin-bottom: 0.4rem;">
-            {meta_html}
+        <div style="font-size: 0.83rem; color: $meta_color; margin-bottom: 0.4rem;">
+            $meta_html
         </div>
-        <div style="font-size: 0.95rem; color: {text_color}; margin-bottom: 0.6rem;">
-            {desc}
+        <div style="font-size: 0.95rem; color: $text_color; margin-bottom: 0.6rem;">
+            $desc
         </div>
         <div>
-            <a href="{link}" target="_blank" style="
+            <a href="$link" target="_blank" style="
                 font-size: 0.9rem;
                 text-decoration: none;
-                color: {link_color};
+                color: $link_color;
                 font-weight: 600;
             ">
                 🔗 Read full article
@@ -283,7 +370,39 @@ def render_news_card(article, dark: bool):
         </div>
     </div>
     """
-    st.markdown(html, unsafe_allow_html=True)
+)
+
+
+def _inline_text(text: str) -> str:
+    # Collapse whitespace before escaping: a blank line inside one card would
+    # end the column's shared HTML block and break every card after it.
+    return html.escape(" ".join(text.split()))
+
+
+def render_card_html(article: Article, dark: bool) -> str:
+    source = _inline_text(article.source)
+    pub = _inline_text(article.pub_date)
+
+    meta_parts = []
+    if source:
+        meta_parts.append(f"<span>Source: <strong>{source}</strong></span>")
+    if pub:
+        meta_parts.append(f"<span>Published: <strong>{pub}</strong></span>")
+    meta_html = " • ".join(meta_parts) if meta_parts else ""
+
+    # Stripped so joined cards form a single HTML block (no blank lines).
+    return _CARD_TEMPLATE.substitute(
+        _DARK_STYLE if dark else _LIGHT_STYLE,
+        title=_inline_text(article.title),
+        desc=_inline_text(article.description),
+        link=_inline_text(article.link),
+        meta_html=meta_html,
+    ).strip()
+
+
+def render_cards_html(articles, dark: bool) -> str:
+    cards = "\n".join(render_card_html(article, dark) for article in articles)
+    return f'<div style="display: grid; grid-template-columns: 1fr;">\n{cards}\n</div>'
 
 
 def render_crypto_news_tab(dark_mode: bool):
@@ -331,27 +450,44 @@ def render_crypto_news_tab(dark_mode: bool):
         st.info("No news articles found for the selected coin / filters.")
         return
 
-    # Filter by search query (client-side)
+    # Filter by search query (client-side, vectorized over all articles)
     if search_query.strip():
-        q = search_query.strip().lower()
-        filtered_items = []
-        for article in news_items:
-            t = (article.get("title") or "").lower()
-            d = (article.get("description") or "").lower()
-            if q in t or q in d:
-                filtered_items.append(article)
-        news_items = filtered_items
+        q = search_query.strip()
+        news_df = pd.DataFrame(news_items, columns=Article._fields)
+        in_title = news_df["title"].str.contains(q, case=False, regex=False)
+        in_desc = news_df["description"].str.contains(q, case=False, regex=False)
+        news_items = list(compress(news_items, in_title | in_desc))
 
     if not news_items:
         st.warning("No articles match your search query.")
         return
 
     # Two-column layout for cards
+    # One markdown element per column instead of one per card.
     col_left, col_right = st.columns(2)
+    col_left.markdown(render_cards_html(news_items[0::2], dark_mode), unsafe_allow_html=True)
+    if news_items[1::2]:
+        col_right.markdown(render_cards_html(news_items[1::2], dark_mode), unsafe_allow_html=True)
+
+
+# =====================================
+# BACKGROUND WORK
+# =====================================
+@st.cache_resource(show_spinner=False)
+def _pool() -> ThreadPoolExecutor:
+    # One process-wide pool shared by every session and rerun.
+    return ThreadPoolExecutor(max_workers=4)
+
+
+def _submit(fn, *args, **kwargs):
+    # Pool threads need the current script context to use Streamlit caches.
+    ctx = get_script_run_ctx()
 
-    for idx, article in enumerate(news_items):
-        with (col_left if idx % 2 == 0 else col_right):
-            render_news_card(article, dark_mode)
+    def run():
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return fn(*args, **kwargs)
+
+    return _pool().submit(run)
 
 
 # =====================================
@@ -381,15 +517,27 @@ This tool uses a Support Vector Regression (SVR) model to predict the price of B
 
     if run_clicked:
         try:
-            df_prices = load_price_data(uploaded_file)
+            price_future = _submit(load_price_data, uploaded_file)
+            # Speculatively warm the news cache so the request overlaps with
+            # model training; the news tab below then reads the cached result.
+            if news_api_key:
+                _submit(
+                    fetch_crypto_news,
+                    api_key=news_api_key,
+                    coin=news_coin,
+                    language=news_language,
+                    items=20,
+                )
+
+            df_prices, data_key = price_future.result()
 
             st.subheader("Raw Data Preview")
-            st.dataframe(df_prices.tail(10), use_container_width=True)
+            st.dataframe(df_prices[["Date", "Price"]].tail(10), use_container_width=True)
 
             X, y = prepare_features(df_prices)
 
             with st.spinner("Training SVR model with time-series cross-validation..."):
-                model, rmse, best_params = train_model(X, y)
+                model, rmse, best_params = train_model(data_key, X, y)
 
             c1, c2 = st.columns(2)
             with c1:
@@ -402,13 +550,23 @@ This tool uses a Support Vector Regression (SVR) model to predict the price of B
 
             st.subheader(f"{prediction_days}-Day Price Forecast")
             st.dataframe(
-                forecast_df.style.format({"Predicted Price": "${:,.2f}"}),
+                forecast_df.assign(
+                    **{"Predicted Price": forecast_df["Predicted Price"].map(lambda v: f"${v:,.2f}")}
+                ),
                 use_container_width=True,
             )
 
             st.subheader("Historical vs Forecast Chart")
-            fig = create_plot(df_prices, forecast_df, prediction_days)
-            st.pyplot(fig)
+            # Long-format frame rendered client-side by Vega-Lite.
+            chart_df = pd.concat(
+                [
+                    df_prices.assign(Series="Historical").rename(columns={"Price": "Value"}),
+                    forecast_df.assign(Series=f"{prediction_days}-Day Forecast").rename(
+                        columns={"Predicted Price": "Value"}
+                    ),
+                ]
+            )[["Date", "Value", "Series"]]
+            st.line_chart(chart_df, x="Date", y="Value", color="Series")
 
         except FileNotFoundError:
             st.error(